@@ -11,10 +11,19 @@ This module also handles logging and configuration for both local and Azure serv
 '''
 
 import os
-from typing import List
+import time
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import List, Union
 
 # For Azure
-from  openai import AzureOpenAI
+from  openai import AzureOpenAI, RateLimitError, InternalServerError, APIConnectionError
 # For local embedding
 from sentence_transformers import SentenceTransformer
 
@@ -24,141 +33,430 @@ from azure.core.credentials import AzureKeyCredential
 
 # FAISS
 import faiss
-import pickle
 import numpy as np
 
 # Import configuration settings for Azure OpenAI and Search
-from config.azure_config import (LOCAL_EMBEDDING_MODEL_NAME,LOCAL_VECTOR_DB_DIRECTORY,
+from config.azure_config import (LOCAL_EMBEDDING_MODEL_NAME,LOCAL_EMBEDDING_BACKEND,LOCAL_EMBEDDING_ONNX_FILE,LOCAL_EMBEDDING_BATCH_SIZE,LOCAL_VECTOR_DB_DIRECTORY,LOCAL_FAISS_INDEX_FACTORY,LOCAL_FAISS_FALLBACK_INDEX_FACTORY,
         AZURE_OPENAI_EMBEDDING_API_KEY, AZURE_OPENAI_EMBEDDING_ENDPOINT, AZURE_OPENAI_EMBEDDING_DEPLOYMENT, AZURE_OPENAI_EMBEDDING_VERSION,
-        AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_ADMIN_KEY, AZURE_SEARCH_INDEX_NAME)
+        AZURE_OPENAI_EMBEDDING_BATCH_SIZE, AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY, AZURE_OPENAI_EMBEDDING_MAX_RETRIES,
+        AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_ADMIN_KEY, AZURE_SEARCH_INDEX_NAME, AZURE_SEARCH_UPLOAD_BATCH_SIZE, AZURE_SEARCH_UPLOAD_WORKERS)
 
 # Set up logging
 from config.logging_config import setup_logging
 logger = setup_logging('embedder')
 
-def get_embedding_local(text: str) -> List[float]:
-    '''Generate embedding for a given text using a local SentenceTransformer model.
-    Args:
-        text (str): The input text to be embedded.
+# Local SentenceTransformer model, loaded once on first use and shared by all callers
+_LOCAL_MODEL = None
+_LOCAL_MODEL_LOCK = threading.Lock()
+
+def _get_local_model() -> SentenceTransformer:
+    '''Load the local SentenceTransformer model once and return the shared instance.
     Returns:
-        List[float]: The embedding vector as a list of floats.
+        SentenceTransformer: The loaded local embedding model.
     '''
-    # Load local model once (on module load)
-    local_model = SentenceTransformer(LOCAL_EMBEDDING_MODEL_NAME)
-    # Check if the model is loaded
-    if not local_model:
-        logger.error("Local embedding model could not be loaded.")
-        return []
-    # Generate embedding using local model
-    return local_model.encode(text).tolist()
+    global _LOCAL_MODEL
+    # Double-checked locking so concurrent callers do not load the model twice
+    if _LOCAL_MODEL is None:
+        with _LOCAL_MODEL_LOCK:
+            if _LOCAL_MODEL is None:
+                # The "onnx" backend runs the model with ONNX Runtime, optionally from a specific (optimized) ONNX file
+                model_kwargs = {"file_name": LOCAL_EMBEDDING_ONNX_FILE} if LOCAL_EMBEDDING_ONNX_FILE else None
+                _LOCAL_MODEL = SentenceTransformer(LOCAL_EMBEDDING_MODEL_NAME, backend=LOCAL_EMBEDDING_BACKEND,
+                                                   model_kwargs=model_kwargs)
+    return _LOCAL_MODEL
 
-def get_embedding_azure(text: str) -> List[float]:
-    '''Generate embedding for a given text using Azure OpenAI service.
+def _retry_delay(headers, attempt: int) -> float:
+    '''Return how long to wait before retrying a throttled or failed request.
+    Honours the service's retry-after-ms or Retry-After header (in seconds or as an HTTP date),
+    otherwise backs off exponentially.
     Args:
-        text (str): The input text to be embedded.
+        headers: The headers of the failed response.
+        attempt (int): Number of attempts made so far, starting at 0.
+    Returns:
+        float: The delay in seconds.
+    '''
+    try:
+        return float(headers["retry-after-ms"]) / 1000
+    except (KeyError, TypeError, ValueError):
+        pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+        try:
+            # HTTP-date form, e.g. "Wed, 21 Oct 2015 07:28:00 GMT"
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return 2 ** attempt
+
+@lru_cache(maxsize=1)
+def _get_azure_client() -> AzureOpenAI:
+    '''Create the Azure OpenAI embedding client once so its HTTP connection pool is reused across requests.
     Returns:
-        List[float]: The embedding vector as a list of floats.
+        AzureOpenAI: The shared Azure OpenAI client.
     '''
-    # Set up Azure OpenAI client
-    client = AzureOpenAI(
+    # Retries are handled in _embed_batch_azure, so disable the client's own retry loop
+    return AzureOpenAI(
         api_key=AZURE_OPENAI_EMBEDDING_API_KEY,
         api_version=AZURE_OPENAI_EMBEDDING_VERSION,
-        azure_endpoint=AZURE_OPENAI_EMBEDDING_ENDPOINT
+        azure_endpoint=AZURE_OPENAI_EMBEDDING_ENDPOINT,
+        max_retries=0
     )
-    try:
-        # Generate embedding using Azure OpenAI
-        response = client.embeddings.create(
-            input=text,
-            model=AZURE_OPENAI_EMBEDDING_DEPLOYMENT
+
+@lru_cache(maxsize=1)
+def _get_embedding_executor() -> ThreadPoolExecutor:
+    '''Create the thread pool that sends embedding requests, bounding the number of requests in flight.
+    Returns:
+        ThreadPoolExecutor: The shared executor with AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY threads.
+    '''
+    return ThreadPoolExecutor(max_workers=AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY, thread_name_prefix="azure-embed")
+
+def _embed_batch_azure(batch: List[str]) -> List[List[float]]:
+    '''Embed one batch of chunks with the shared Azure OpenAI client, backing off and retrying when
+    throttled or on transient failures (connection errors, timeouts, 5xx responses).
+    Args:
+        batch (List[str]): The text chunks sent in this request.
+    Returns:
+        List[List[float]]: List of embedding vectors for the batch, in input order.
+    Raises:
+        openai.APIError: If the request still fails after all retries, or fails with a non-retryable error.
+    '''
+    for attempt in range(AZURE_OPENAI_EMBEDDING_MAX_RETRIES + 1):
+        try:
+            response = _get_azure_client().embeddings.create(
+                input=batch,
+                model=AZURE_OPENAI_EMBEDDING_DEPLOYMENT
+            )
+            # The service may return items out of order, so sort them back by their index
+            return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+        # APITimeoutError is a subclass of APIConnectionError
+        except (RateLimitError, InternalServerError, APIConnectionError) as e:
+            if attempt == AZURE_OPENAI_EMBEDDING_MAX_RETRIES:
+                raise
+            # Connection errors and timeouts have no response to take a Retry-After header from
+            response = getattr(e, "response", None)
+            delay = _retry_delay(response.headers, attempt) if response is not None else 2 ** attempt
+            logger.warning("Azure embedding failed (%s), retrying in %ss (attempt %d/%d)",
+                           type(e).__name__, delay, attempt + 1, AZURE_OPENAI_EMBEDDING_MAX_RETRIES)
+            time.sleep(delay)
+
+def get_embeddings_azure_batch(chunks: List[str], batch_size: int = AZURE_OPENAI_EMBEDDING_BATCH_SIZE) -> List[List[float]]:
+    '''Generate embeddings for a list of text chunks using Azure OpenAI, sending several chunks per request
+    and several requests concurrently.
+    Args:
+        chunks (List[str]): List of text chunks to be embedded.
+        batch_size (int): Maximum number of chunks sent in a single embeddings request.
+    Returns:
+        List[List[float]]: List of embedding vectors for each chunk, in input order.
+            Chunks of a failed request get an empty list.
+    '''
+    # Split the chunks into request-sized batches and embed them concurrently on the shared executor
+    batches = [chunks[start:start + batch_size] for start in range(0, len(chunks), batch_size)]
+    executor = _get_embedding_executor()
+    futures = [executor.submit(_embed_batch_azure, batch) for batch in batches]
+
+    embeddings = []
+    for idx, (batch, future) in enumerate(zip(batches, futures)):
+        start = idx * batch_size
+        try:
+            embeddings.extend(future.result())
+        except Exception as e:
+            logger.error("Azure embedding failed for chunks [%d-%d]: %s", start + 1, start + len(batch), e)
+            embeddings.extend([] for _ in batch)
+    logger.info(" Azure Embedding [%d chunks in %d requests]", len(chunks), len(batches))
+    return embeddings
+
+def _embed_chunks(chunks: List[str], use_azure: bool) -> Union[np.ndarray, List[List[float]]]:
+    '''Embed text chunks with the selected backend, without consulting the embedding cache.
+    Args:
+        chunks (List[str]): List of text chunks to be embedded.
+        use_azure (bool): Flag to determine whether to use Azure OpenAI for embeddings.
+    Returns:
+        Union[np.ndarray, List[List[float]]]: Embedding vectors for each chunk, as a float32 matrix for the
+            local model and as a list of vectors for Azure OpenAI.
+    '''
+    if not use_azure:   # Use local SentenceTransformer model, encoding all chunks in batched forward passes
+        # encode() sorts the inputs by length before batching and restores the original order afterwards,
+        # so each batch holds similarly sized chunks and little compute is spent on padding tokens.
+        # This only works when the whole list is passed in a single call.
+        embeddings = _get_local_model().encode(
+            chunks,
+            batch_size=LOCAL_EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            show_progress_bar=False
         )
-        return response.data[0].embedding
-    except Exception as e:
-        logger.error(f"Azure embedding failed: {e}")
-        return []
+        logger.info(" Local Embedding [%d chunks] - Length: %d", len(chunks), embeddings.shape[1])
+        return embeddings
+
+    # Use Azure OpenAI for embeddings, several chunks per request
+    return get_embeddings_azure_batch(chunks)
+
+# Embedding cache keyed on (content hash, model) so unchanged chunks are not re-embedded on re-ingestion
+EMBEDDING_CACHE_PATH = os.path.join(LOCAL_VECTOR_DB_DIRECTORY, "emb_cache.sqlite")
+# Stay below SQLite's limit on the number of bound parameters per statement
+_CACHE_QUERY_BATCH = 500
+
+def _embedding_model_key(use_azure: bool) -> str:
+    '''Return the identifier of the embedding model in use, so switching models or deployments invalidates the cache.
+    Args:
+        use_azure (bool): Flag to determine whether Azure OpenAI is used for embeddings.
+    Returns:
+        str: The model identifier stored alongside cached embeddings.
+    '''
+    if use_azure:
+        return f"azure:{AZURE_OPENAI_EMBEDDING_DEPLOYMENT}"
+    # Optimized ONNX graphs can produce slightly different vectors, so keep them apart from the torch ones
+    if LOCAL_EMBEDDING_BACKEND != "torch":
+        return f"local:{LOCAL_EMBEDDING_MODEL_NAME}:{LOCAL_EMBEDDING_BACKEND}:{LOCAL_EMBEDDING_ONNX_FILE or ''}"
+    return f"local:{LOCAL_EMBEDDING_MODEL_NAME}"
+
+# One connection per thread, opened on first use
+_embedding_cache = threading.local()
+
+def _get_embedding_cache() -> sqlite3.Connection:
+    '''Return this thread's connection to the embedding cache, creating the database on first use.
+    Returns:
+        sqlite3.Connection: Connection to the embedding cache.
+    '''
+    conn = getattr(_embedding_cache, "conn", None)
+    if conn is None:
+        os.makedirs(LOCAL_VECTOR_DB_DIRECTORY, exist_ok=True)
+        # Wait for a concurrent writer (e.g. the query embedding next to the pipeline's embed stage)
+        # instead of failing with "database is locked"
+        conn = sqlite3.connect(EMBEDDING_CACHE_PATH, timeout=30)
+        # Write-ahead logging lets lookups run while another connection is writing
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "hash TEXT NOT NULL, model TEXT NOT NULL, dim INTEGER NOT NULL, vec BLOB NOT NULL, "
+            "PRIMARY KEY (hash, model))"
+        )
+        _embedding_cache.conn = conn
+    return conn
 
-def get_embeddings(chunks: List[str], use_azure: bool = False) -> List[List[float]]:
+def get_embeddings(chunks: List[str], use_azure: bool = False) -> np.ndarray:
     '''Generate embeddings for a list of text chunks.
+    Embeddings are looked up in the local embedding cache first; only chunks not seen before with the
+    current model are sent to the embedding backend.
     Args:
         chunks (List[str]): List of text chunks to be embedded.
         use_azure (bool): Flag to determine whether to use Azure OpenAI for embeddings.
     Returns:
-        List[List[float]]: List of embedding vectors for each chunk.
+        np.ndarray: Float32 matrix of shape (len(chunks), dim) with one embedding vector per row.
+    Raises:
+        RuntimeError: If any chunk could not be embedded.
     '''
-    embeddings = []
-    # Determine which embedding function to use based on the flag
-    for idx, chunk in enumerate(chunks):
-        if use_azure:   # Use Azure OpenAI for embeddings if the flag is set
-            emb = get_embedding_azure(chunk)
-            logger.info(f" Azure Embedding [{idx+1}/{len(chunks)}] - Length: {len(emb)}")
-        else:           # Use local SentenceTransformer model for embeddings
-            emb = get_embedding_local(chunk)
-            logger.info(f" Local Embedding [{idx+1}/{len(chunks)}] - Length: {len(emb)}")
-        embeddings.append(emb)
+    if not chunks:
+        return np.empty((0, 0), dtype=np.float32)
+
+    model = _embedding_model_key(use_azure)
+    hashes = [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks]
+
+    conn = _get_embedding_cache()
+    # Look up cached embeddings in bulk
+    cached = {}
+    unique_hashes = list(dict.fromkeys(hashes))
+    for start in range(0, len(unique_hashes), _CACHE_QUERY_BATCH):
+        batch = unique_hashes[start:start + _CACHE_QUERY_BATCH]
+        rows = conn.execute(
+            f"SELECT hash, vec FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+            [model, *batch]
+        )
+        for h, vec in rows:
+            cached[h] = np.frombuffer(vec, dtype=np.float32)
+
+    # Embed only the chunks missing from the cache, each distinct chunk once
+    misses = {h: chunk for h, chunk in zip(hashes, chunks) if h not in cached}
+    logger.info("Embedding cache: %d hits, %d misses", len(cached), len(misses))
+    if misses:
+        new_embeddings = _embed_chunks(list(misses.values()), use_azure)
+        rows = []
+        for h, emb in zip(misses, new_embeddings):
+            cached[h] = emb
+            # Failed embeddings come back empty and must not be cached
+            if len(emb):
+                rows.append((h, model, len(emb), np.asarray(emb, dtype=np.float32).tobytes()))
+        # Only open a write transaction when there is something to store
+        if rows:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO embeddings (hash, model, dim, vec) VALUES (?, ?, ?, ?)", rows)
+
+    # Fail loudly rather than return a ragged result that cannot be indexed
+    failed = sum(1 for h in hashes if not len(cached[h]))
+    if failed:
+        logger.error("Failed to embed %d of %d chunks.", failed, len(chunks))
+        raise RuntimeError(f"Failed to embed {failed} of {len(chunks)} chunks.")
+
+    # Fill a pre-allocated float32 matrix directly instead of building a nested list and converting it
+    embeddings = np.empty((len(chunks), len(cached[hashes[0]])), dtype=np.float32)
+    for i, h in enumerate(hashes):
+        embeddings[i] = cached[h]
     return embeddings
 
-def store_in_azure_ai_search(chunks: List[str], embeddings: List[List[float]]):
-    '''Store embeddings in Azure AI Search.
-    Args:
-        chunks (List[str]): List of text chunks.
-        embeddings (List[List[float]]): List of embedding vectors.
+@lru_cache(maxsize=1)
+def _get_search_client() -> SearchClient:
+    '''Create the Azure AI Search client once so its HTTP connections are reused across uploads.
+    Returns:
+        SearchClient: The shared Azure AI Search client.
     '''
-    # Set up Azure Search client
-    client = SearchClient(
+    return SearchClient(
         endpoint=AZURE_SEARCH_ENDPOINT,
         index_name=AZURE_SEARCH_INDEX_NAME,
         credential=AzureKeyCredential(AZURE_SEARCH_ADMIN_KEY)
     )
 
+def _upload_batch(batch: List[dict]) -> int:
+    '''Upload one batch of documents to Azure AI Search.
+    Args:
+        batch (List[dict]): The documents to upload.
+    Returns:
+        int: Number of documents indexed successfully.
+    '''
+    try:
+        result = _get_search_client().upload_documents(documents=batch)
+        succeeded = sum(1 for r in result if r.succeeded)
+        if succeeded < len(batch):
+            logger.error("❌ Azure Search rejected %d of %d documents", len(batch) - succeeded, len(batch))
+        return succeeded
+    except Exception as e:
+        logger.error("❌ Azure Search upload of %d documents failed: %s", len(batch), e)
+        return 0
+
+def store_in_azure_ai_search(chunks: List[str], embeddings: np.ndarray, start_id: int = 0) -> int:
+    '''Store embeddings in Azure AI Search.
+    Documents are uploaded in batches of AZURE_SEARCH_UPLOAD_BATCH_SIZE, several batches at a time,
+    to stay within the service's per-request size limits.
+    Args:
+        chunks (List[str]): List of text chunks.
+        embeddings (np.ndarray): Embedding matrix with one vector per chunk.
+        start_id (int): Number of the first document id, so successive uploads do not overwrite each other.
+    Returns:
+        int: Number of documents the service accepted.
+    '''
     # Prepare documents for upload
-    batch = []
-    for i, (chunk, vector) in enumerate(zip(chunks, embeddings)):
-        doc = {
-            "id": f"doc-{i}",
+    docs = (
+        {
+            "id": f"doc-{start_id + i}",
             "content": chunk,
-            "embedding": vector
+            "embedding": vector.tolist()
         }
-        batch.append(doc)
+        for i, (chunk, vector) in enumerate(zip(chunks, embeddings))
+    )
+    batches = iter(lambda: list(islice(docs, AZURE_SEARCH_UPLOAD_BATCH_SIZE)), [])
+
+    # Upload the batches to Azure AI Search concurrently
+    with ThreadPoolExecutor(max_workers=AZURE_SEARCH_UPLOAD_WORKERS) as executor:
+        uploaded = sum(executor.map(_upload_batch, batches))
+    logger.info("✅ Uploaded %d documents to Azure AI Search", uploaded)
+    return uploaded
+
 
+def _min_training_size(index: faiss.Index) -> int:
+    '''Return the number of vectors needed to train a FAISS index reliably.
+    Args:
+        index (faiss.Index): The untrained FAISS index.
+    Returns:
+        int: Minimum number of training vectors.
+    '''
     try:
-        # Upload documents to Azure AI Search
-        result = client.upload_documents(documents=batch)
-        logger.info(f"✅ Uploaded {len(result)} documents to Azure AI Search")
-    except Exception as e:
-        logger.error(f"❌ Azure Search upload failed: {e}")
+        # IVF indexes need ~39 points per inverted list to train their coarse quantizer
+        return faiss.extract_index_ivf(index).nlist * 39
+    except RuntimeError:
+        # Otherwise the PQ codebooks need at least 256 points (one per centroid)
+        return 256
+
+def _index_factory_string(n: int, dim: int) -> str:
+    '''Return the FAISS index factory string for a corpus of n vectors of the given dimension.
+    Unless LOCAL_FAISS_INDEX_FACTORY names a specific index, an IVF+PQ index is sized from the corpus:
+    about 4*sqrt(n) inverted lists, and dim/4 PQ sub-quantizers of 8 bits each (1 byte per 4 dimensions).
+    Args:
+        n (int): Number of vectors in the corpus.
+        dim (int): Dimension of the vectors.
+    Returns:
+        str: The index factory string.
+    '''
+    if LOCAL_FAISS_INDEX_FACTORY != "auto":
+        return LOCAL_FAISS_INDEX_FACTORY
+    nlist = max(1, int(4 * np.sqrt(n)))
+    # PQ needs the sub-quantizers to split the dimensions evenly; otherwise compress each dimension to int8
+    codec = f"PQ{dim // 4}x8" if dim % 4 == 0 else "SQ8"
+    return f"IVF{nlist},{codec}"
+
+def _build_faiss_index(xb: np.ndarray) -> faiss.Index:
+    '''Build and fill a FAISS inner-product index using the configured (or corpus-sized) index factory string.
+    Vectors are expected to be L2-normalized so that scores are cosine similarities.
+    Falls back to LOCAL_FAISS_FALLBACK_INDEX_FACTORY when the corpus is too small to train that index.
+    Args:
+        xb (np.ndarray): Embedding matrix of shape (n, dim), dtype float32.
+    Returns:
+        faiss.Index: The trained FAISS index holding all vectors.
+    '''
+    dim = xb.shape[1]
+    factory = _index_factory_string(len(xb), dim)
+    # Inner product on unit-normalized vectors equals cosine similarity
+    index = faiss.index_factory(dim, factory, faiss.METRIC_INNER_PRODUCT)
+
+    # Corpora too small for the configured index use the fallback index (int8 scalar quantizer by default,
+    # which only needs per-dimension min/max to train and stores d bytes per vector instead of 4*d)
+    if not index.is_trained and len(xb) < _min_training_size(index):
+        logger.warning(f"Only {len(xb)} vectors, too few to train {factory}; using {LOCAL_FAISS_FALLBACK_INDEX_FACTORY}")
+        index = faiss.index_factory(dim, LOCAL_FAISS_FALLBACK_INDEX_FACTORY, faiss.METRIC_INNER_PRODUCT)
 
+    # Train the quantizers (OPQ rotation, IVF centroids, PQ codebooks, SQ ranges) on the corpus itself
+    if not index.is_trained:
+        index.train(xb)
 
-def store_in_local_faiss(chunks: List[str], embeddings: List[List[float]]):
+    index.add(xb)
+    return index
+
+def store_in_local_faiss(chunks: List[str], embeddings: np.ndarray):
     '''Store embeddings in a local FAISS index.
     Args:
         chunks (List[str]): List of text chunks.
-        embeddings (List[List[float]]): List of embedding vectors.
+        embeddings (np.ndarray): Float32 embedding matrix with one vector per chunk. It is L2-normalized in place.
     '''
     # Ensure local_db directory exists
     dir = LOCAL_VECTOR_DB_DIRECTORY
     os.makedirs(dir, exist_ok=True)
 
-    # Initialize FAISS index
-    dim = len(embeddings[0])
-    index = faiss.IndexFlatL2(dim)
+    # Normalize embeddings in place so inner-product search ranks by cosine similarity
+    # (no copy is made when get_embeddings already returned a contiguous float32 matrix)
+    xb = np.ascontiguousarray(embeddings, dtype=np.float32)
+    faiss.normalize_L2(xb)
 
-    # Add embeddings
-    index.add(np.array(embeddings).astype('float32'))
+    # Build the FAISS index and add embeddings
+    index = _build_faiss_index(xb)
 
-    # Save FAISS index
-    faiss.write_index(index, f"{dir}/faiss.index")
+    # Save FAISS index to a temporary file and swap it in, so a retriever that has the current index
+    # memory-mapped keeps reading the old, complete file instead of one being overwritten
+    faiss.write_index(index, f"{dir}/faiss.index.tmp")
+    os.replace(f"{dir}/faiss.index.tmp", f"{dir}/faiss.index")
 
-    # Save chunk text mapping
-    with open(f"{dir}/id_to_chunk.pkl", "wb") as f:
-        pickle.dump(chunks, f)
+    # Save chunk text mapping keyed by FAISS id, so queries can fetch just the k hits instead of loading every chunk.
+    # Write to a temporary file first so a concurrent reader never sees a half-written mapping.
+    tmp_path = f"{dir}/chunks.sqlite.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        with conn:
+            conn.execute("CREATE TABLE chunks (id INTEGER PRIMARY KEY, text TEXT NOT NULL)")
+            conn.executemany("INSERT INTO chunks (id, text) VALUES (?, ?)", enumerate(chunks))
+    finally:
+        conn.close()
+    os.replace(tmp_path, f"{dir}/chunks.sqlite")
 
     logger.info(f"✅ Stored {len(embeddings)} embeddings in local FAISS index")
 
-def store_embeddings(chunks: List[str], embeddings: List[List[float]], use_azure: bool = False):
+def store_embeddings(chunks: List[str], embeddings: np.ndarray, use_azure: bool = False):
     '''
     Store embeddings in either Azure AI Search or local FAISS index.
     Args:
         chunks (List[str]): List of text chunks.
-        embeddings (List[List[float]]): List of embedding vectors.
+        embeddings (np.ndarray): Embedding matrix with one vector per chunk.
         use_azure (bool): Flag to determine whether to use Azure AI Search for storage.
     '''
     if use_azure:
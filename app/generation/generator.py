@@ -4,6 +4,7 @@ This module provides a function to generate answers based on a query and context
 '''
 
 import os
+from functools import lru_cache
 from typing import List
 
 # Azure OpenAI
@@ -14,12 +15,48 @@ from config.azure_config import (AZURE_OPENAI_CHAT_COMPLETION_API_KEY, AZURE_OPE
                                  LOCAL_LLM_MODEL_PATH)
 
 # Hugging Face Transformers (for local LLM)
+import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
 
 # Set up logging
 from config.logging_config import setup_logging
 logger = setup_logging('generator')
 
+@lru_cache(maxsize=1)
+def _get_azure_client() -> AzureOpenAI:
+    '''
+    Create the Azure OpenAI chat client once so its HTTP connections are reused across requests.
+    Returns:
+        AzureOpenAI: The shared Azure OpenAI client.
+    '''
+    return AzureOpenAI(
+        api_key=AZURE_OPENAI_CHAT_COMPLETION_API_KEY,
+        api_version=AZURE_OPENAI_CHAT_COMPLETION_VERSION,
+        azure_endpoint=AZURE_OPENAI_CHAT_COMPLETION_ENDPOINT
+    )
+
+@lru_cache(maxsize=1)
+def _get_local_pipeline():
+    '''
+    Load the local LLM and its tokenizer once and wrap them in a text generation pipeline.
+    Returns:
+        Pipeline: The shared text generation pipeline.
+    '''
+    # Use half precision on GPU (bfloat16 where supported) to halve memory and speed up attention;
+    # CPUs stay in float32 but use every core
+    if torch.cuda.is_available():
+        dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    else:
+        dtype = torch.float32
+        torch.set_num_threads(os.cpu_count() or 1)
+
+    # Load the tokenizer and model from the local model path, placing the weights on the available devices.
+    # Transformers picks the SDPA attention kernels by default for models that support them.
+    tokenizer = AutoTokenizer.from_pretrained(LOCAL_LLM_MODEL_PATH)
+    model = AutoModelForCausalLM.from_pretrained(LOCAL_LLM_MODEL_PATH, torch_dtype=dtype, device_map="auto")
+    # Create a text generation pipeline
+    return pipeline("text-generation", model=model, tokenizer=tokenizer)
+
 def generate_answer_azure(query: str, context_chunks: List[str]) -> str:
     '''
     Generate an answer using Azure OpenAI's LLM based on the provided query and context chunks.
@@ -30,12 +67,8 @@ def generate_answer_azure(query: str, context_chunks: List[str]) -> str:
         str: The generated answer.
     '''
     
-    # Set up Azure OpenAI client
-    client = AzureOpenAI(
-        api_key=AZURE_OPENAI_CHAT_COMPLETION_API_KEY,
-        api_version=AZURE_OPENAI_CHAT_COMPLETION_VERSION,
-        azure_endpoint=AZURE_OPENAI_CHAT_COMPLETION_ENDPOINT
-    )
+    # Get the shared Azure OpenAI client
+    client = _get_azure_client()
     deployment = AZURE_OPENAI_CHAT_COMPLETION_DEPLOYMENT
 
     # Construct the prompt for the LLM
@@ -77,8 +110,6 @@ def generate_answer_local(query: str, context_chunks: List[str]) -> str:
     '''
     logger.info("Generating answer using local LLM")
     try:
-        # Load local model path from environment variable
-        model_path = LOCAL_LLM_MODEL_PATH
         # Join context chunks into a single string
         context = "\n".join(context_chunks)
         # Construct the prompt with context and query
@@ -89,13 +120,12 @@ Context:
 Question:
 {query}
 """
-        # Load the tokenizer and model
-        tokenizer = AutoTokenizer.from_pretrained(model_path)
-        model = AutoModelForCausalLM.from_pretrained(model_path)
-        # Create a text generation pipeline
-        pipe = pipeline("text-generation", model=model, tokenizer=tokenizer)
+        # Get the shared text generation pipeline (loaded on first use)
+        pipe = _get_local_pipeline()
         # Generate the answer using the local model
-        output = pipe(prompt, max_new_tokens=256, temperature=0.3)
+        # Greedy decoding with the KV cache; return only the newly generated text, not the prompt
+        output = pipe(prompt, max_new_tokens=256, do_sample=False, return_full_text=False,
+                      pad_token_id=pipe.tokenizer.eos_token_id)
         return output[0]['generated_text'].split("Answer:")[-1].strip()
 
     except Exception as e:
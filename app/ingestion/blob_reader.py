@@ -2,49 +2,85 @@
 This module provides functionality to download all blobs from a specified Azure Blob Storage container.
 '''
 import os
+import asyncio
+from functools import lru_cache
 from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 from datetime import datetime, timedelta
-from config.azure_config import AZURE_STORAGE_CONNECTION_STRING, AZURE_STORAGE_ACCOUNT_KEY
+from config.azure_config import AZURE_STORAGE_CONNECTION_STRING, AZURE_STORAGE_ACCOUNT_KEY, AZURE_STORAGE_MAX_CONCURRENT_DOWNLOADS
 
 # Set up logging
 from config.logging_config import setup_logging
 logger = setup_logging('blob_reader')
 
-def download_blobs(container_name: str, download_folder: str):
+@lru_cache(maxsize=1)
+def _get_blob_service_client() -> BlobServiceClient:
     '''
-    Download all blobs from a specified Azure Blob Storage container to a local folder.
+    Create the BlobServiceClient once so its HTTP connections are reused across calls.
+    Returns:
+        BlobServiceClient: The shared blob service client.
+    '''
+    return BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+
+async def download_blobs_async(container_name: str, download_folder: str,
+                               max_concurrency: int = AZURE_STORAGE_MAX_CONCURRENT_DOWNLOADS):
+    '''
+    Download all blobs from a specified Azure Blob Storage container to a local folder, several blobs at a time.
+    Only needed for offline processing; text extraction reads blobs directly through SAS URLs (see generate_sas_url).
     Args:
         container_name (str): The name of the Azure Blob Storage container.
         download_folder (str): The local folder where the blobs will be downloaded.
+        max_concurrency (int): Maximum number of blobs downloaded at the same time.
     Raises:
         ValueError: If the Azure Storage connection string is not set or if the container does not exist.
     '''
     # Ensure the download folder exists and if not, create it
     os.makedirs(download_folder, exist_ok=True)
 
-    # Create a BlobServiceClient using the connection string
+    # Create an async BlobServiceClient using the connection string
     if not AZURE_STORAGE_CONNECTION_STRING:
         logger.error("Azure Storage connection string is not set in the environment variables.")
         raise ValueError("Azure Storage connection string is not set in the environment variables.")
-    blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
 
-    # Get the container client
-    container_client = blob_service_client.get_container_client(container_name)
+    async with AsyncBlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING) as blob_service_client:
+        container_client = blob_service_client.get_container_client(container_name)
+
+        # Check if the container exists
+        if not await container_client.exists():
+            logger.error(f"Container '{container_name}' does not exist in blob storage.")
+            raise ValueError(f"Container '{container_name}' does not exist in blob storage.")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _download(blob_name: str):
+            async with semaphore:
+                # Write the blob chunk by chunk so memory use is bounded by the chunk size, not the blob size.
+                # File I/O runs in worker threads so a slow disk does not stall the other downloads on the event loop.
+                blob_data = await container_client.download_blob(blob_name)
+                f = await asyncio.to_thread(open, os.path.join(download_folder, blob_name), "wb")
+                try:
+                    async for chunk in blob_data.chunks():
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
 
-    # Check if the container exists
-    if not container_client.exists():
-        logger.error(f"Container '{container_name}' does not exist in blob storage.")
-        raise ValueError(f"Container '{container_name}' does not exist in blob storage.")
-    
-    # List and download all blobs in the container to data folder
-    for blob in container_client.list_blobs():
-        blob_path = os.path.join(download_folder, blob.name)
-        with open(blob_path, "wb") as f:
-            blob_data = container_client.download_blob(blob.name)
-            f.write(blob_data.readall())
+        # List and download all blobs in the container to data folder concurrently
+        await asyncio.gather(*[_download(blob.name) async for blob in container_client.list_blobs()])
 
     logger.info(f"✅ All files downloaded to: {download_folder}")
 
+def download_blobs(container_name: str, download_folder: str):
+    '''
+    Download all blobs from a specified Azure Blob Storage container to a local folder.
+    Synchronous wrapper around download_blobs_async.
+    Args:
+        container_name (str): The name of the Azure Blob Storage container.
+        download_folder (str): The local folder where the blobs will be downloaded.
+    Raises:
+        ValueError: If the Azure Storage connection string is not set or if the container does not exist.
+    '''
+    asyncio.run(download_blobs_async(container_name, download_folder))
+
 def generate_sas_url(container_name: str, expiry_hours: int = 1) -> list[str]:
     '''
     Generate a Shared Access Signature (SAS) URL for a blob in Azure Blob Storage.
@@ -56,8 +92,8 @@ def generate_sas_url(container_name: str, expiry_hours: int = 1) -> list[str]:
         list[str]: A list of SAS URLs for each blob in the container.    
     '''
     try:
-        # Create a BlobServiceClient using the connection string
-        blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+        # Get the shared BlobServiceClient created from the connection string
+        blob_service_client = _get_blob_service_client()
         container_client = blob_service_client.get_container_client(container_name)
         account_name = blob_service_client.account_name
 
@@ -4,15 +4,29 @@ This module provides functionality to extract text from documents using Azure Fo
 '''
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
 from azure.ai.formrecognizer import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
-from config.azure_config import AZURE_FORM_RECOGNIZER_ENDPOINT, AZURE_FORM_RECOGNIZER_KEY
+from config.azure_config import AZURE_FORM_RECOGNIZER_ENDPOINT, AZURE_FORM_RECOGNIZER_KEY, AZURE_FORM_RECOGNIZER_MAX_WORKERS
 
 # Set up logging
 from config.logging_config import setup_logging
 logger = setup_logging('text_extractor')
 
+@lru_cache(maxsize=1)
+def _get_document_client() -> DocumentAnalysisClient:
+    '''
+    Create the Document Analysis Client once; it is thread-safe and reusing it keeps its HTTP connections open.
+    Returns:
+        DocumentAnalysisClient: The shared Form Recognizer client.
+    '''
+    return DocumentAnalysisClient(
+        endpoint=AZURE_FORM_RECOGNIZER_ENDPOINT,
+        credential=AzureKeyCredential(AZURE_FORM_RECOGNIZER_KEY)
+    )
+
 def extract_text_from_file(file_path: str) -> str:
     '''
     Extract text from a document file using Azure Form Recognizer.
@@ -25,24 +39,44 @@ def extract_text_from_file(file_path: str) -> str:
         Exception: If there is an error during text extraction.
     '''
 
-    # Initialize the Document Analysis Client
-    client = DocumentAnalysisClient(
-        endpoint=AZURE_FORM_RECOGNIZER_ENDPOINT,
-        credential=AzureKeyCredential(AZURE_FORM_RECOGNIZER_KEY)
-    )
-
     # Open the file and analyze it 
     with open(file_path, "rb") as f:
-        poller = client.begin_analyze_document("prebuilt-read", document=f)
+        poller = _get_document_client().begin_analyze_document("prebuilt-read", document=f)
         result = poller.result()
 
     # Extract text from the result, combining all lines into a single string and returning it
     full_text = "\n".join([line.content for page in result.pages for line in page.lines])
     return full_text
 
+def process_document(file_path: str, output_folder: str) -> tuple[str, str]:
+    '''
+    Extract text from a single document, save it to the output folder and delete the original file.
+    Args:
+        file_path (str): The path to the document file.
+        output_folder (str): The folder where the extracted text file will be saved.
+    Returns:
+        tuple[str, str]: The path of the saved text file and the extracted text.
+    Raises:
+        Exception: If there is an error during text extraction.
+    '''
+    # Extract text from the file and save it to the output_path
+    filename = os.path.basename(file_path)
+    text = extract_text_from_file(file_path)
+    output_path = os.path.join(output_folder, filename + ".txt")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    # Delete the original file after processing
+    os.remove(file_path)
+    logger.info("✅ Successfully processed %s and saved to %s", filename, output_path)
+    return output_path, text
+
 def process_all_documents(input_folder: str, output_folder: str) -> None:
     '''
     Process all documents in the input folder and save extracted text to the output folder.
+    Offline fallback for documents already on local disk. Ingestion from Azure Blob Storage goes through
+    run_pipeline (app/pipeline/pipeline.py), which calls extract_text_from_url per document and so avoids
+    downloading and re-uploading them.
     Args:
         input_folder (str): The folder containing the document files to process.
         output_folder (str): The folder where the extracted text files will be saved.
@@ -55,24 +89,18 @@ def process_all_documents(input_folder: str, output_folder: str) -> None:
     # Ensure the output folder exists and if not, create it
     os.makedirs(output_folder, exist_ok=True)
 
-    # Process each file in the input folder
-    for filename in os.listdir(input_folder):
-        
+    def _process_one(filename: str):
         # Define the full path of the file
         file_path = os.path.join(input_folder, filename)
-        logger.info(f"🔍 Processing: {filename} at {file_path}")
+        logger.info("🔍 Processing: %s at %s", filename, file_path)
         try:
-            # Extract text from the file and save it to the output_path
-            text = extract_text_from_file(file_path)
-            output_path = os.path.join(output_folder, filename + ".txt")
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(text)
-            
-            # Delete the original file after processing
-            os.remove(file_path)
-            logger.info(f"✅ Successfully processed {filename} and saved to {output_path}")
+            process_document(file_path, output_folder)
         except Exception as e:
-            logger.error(f"❌ Failed to process {filename}: {e}")
+            logger.error("❌ Failed to process %s: %s", filename, e)
+
+    # Process the files in the input folder concurrently; each worker mostly waits on the Form Recognizer poller
+    with ThreadPoolExecutor(max_workers=AZURE_FORM_RECOGNIZER_MAX_WORKERS) as executor:
+        list(executor.map(_process_one, os.listdir(input_folder)))
 
 def flatten_table(table) -> str:
     """
@@ -82,78 +110,97 @@ def flatten_table(table) -> str:
     Returns:
         str: A string representation of the table with rows and columns.
     """
-    rows = []
-    for row_idx in range(len(table.cells) // table.column_count):
-        row = []
-        for col_idx in range(table.column_count):
-            cell = next(
-                (c for c in table.cells if c.row_index == row_idx and c.column_index == col_idx), 
-                None
-            )
-            row.append(cell.content.strip() if cell else "")
-        rows.append(" | ".join(row))
+    # Index the cells by position once, instead of scanning all cells for every row/column pair
+    grid = {(c.row_index, c.column_index): c.content.strip() for c in table.cells}
+    rows = [
+        " | ".join(grid.get((row_idx, col_idx), "") for col_idx in range(table.column_count))
+        for row_idx in range(table.row_count)
+    ]
     return "\n".join(rows)
 
+def extract_text_from_url(sas_url: str) -> str:
+    '''
+    Extract text from a document in Azure Blob Storage.
+    Form Recognizer fetches the document directly from storage through the SAS URL,
+    so the document is never downloaded to or uploaded from this machine.
+    Args:
+        sas_url (str): SAS URL pointing to the document in Azure Blob Storage.
+    Returns:
+        str: The extracted text.
+    Raises:
+        Exception: If there is an error during text extraction.
+    '''
+    logger.info("🔍 Processing file from SAS URL: %s", sas_url)
+    # Analyze the document using the prebuilt-document model
+    poller = _get_document_client().begin_analyze_document_from_url(model_id="prebuilt-document", document_url=sas_url)
+    result = poller.result()
+    doc_text = []
+
+    # Extract Paragraphs from the result
+    if result.paragraphs:
+        para = []
+        for paragraph in result.paragraphs:
+            if paragraph.content:
+                para.append(paragraph.content.strip())
+        doc_text.append("\n".join(para))
+    
+    # Extract key-value pairs from the result
+    if result.key_value_pairs:
+        kv = []
+        for kvp in result.key_value_pairs:
+            if kvp.value and kvp.value.content.strip():
+                kv.append(f"{kvp.key.content.strip()}: {kvp.value.content.strip()}")
+        doc_text.append("\n".join(kv))
+
+    # Extract tables from the result
+    if result.tables:
+        tbl = []
+        for table in result.tables:
+            flat_table = flatten_table(table)
+            if flat_table:
+                tbl.append(flat_table)
+        doc_text.append("\n".join(tbl))
+    # Combine all extracted text into a single string
+    return "\n\n".join(doc_text)
+
+def process_blob_url(sas_url: str, output_folder: str) -> tuple[str, str]:
+    '''
+    Extract text from a document in Azure Blob Storage and save it to the output folder.
+    Args:
+        sas_url (str): SAS URL pointing to the document in Azure Blob Storage.
+        output_folder (str): The folder where the extracted text file will be saved.
+    Returns:
+        tuple[str, str]: The path of the saved text file and the extracted text.
+    Raises:
+        Exception: If there is an error during text extraction.
+    '''
+    full_text = extract_text_from_url(sas_url)
+
+    # Save the extracted text to a file
+    output_filename = urlparse(sas_url).path.split('/')[-1].split('.')[0] + ".txt"
+    output_path = os.path.join(output_folder, output_filename)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(full_text)
+    logger.info("✅ Successfully processed file: %s and saved to %s", output_filename, output_path)
+    return output_path, full_text
+
 def process_blob_files(sas_urls: list[str], output_folder: str) -> None:
     '''
     Process documents from Azure Blob Storage using SAS URLs and extract text.
+    Sequential convenience wrapper for a list of SAS URLs outside the ingestion pipeline; run_pipeline
+    calls extract_text_from_url per document itself, concurrently with chunking and embedding.
     Args:
         sas_urls (list[str]): List of SAS URLs pointing to the documents in Azure Blob Storage.
         output_folder (str): The folder where the extracted text files will be saved.
-    Raises:
-        Exception: If there is an error during processing of any file.
     Returns:
         None
     '''
-    try:
-        # Initialize the Document Analysis Client
-        client = DocumentAnalysisClient(
-            endpoint=AZURE_FORM_RECOGNIZER_ENDPOINT,
-            credential=AzureKeyCredential(AZURE_FORM_RECOGNIZER_KEY)
-        )
-
-        # Start the analysis process
-        for sas_url in sas_urls:
-            logger.info(f"🔍 Processing file from SAS URL: {sas_url}")
-            # Analyze the document using the prebuilt-document model
-            poller = client.begin_analyze_document_from_url(model_id="prebuilt-document", document_url=sas_url)
-            result = poller.result()
-            doc_text = []
-
-            # Extract Paragraphs from the result
-            if result.paragraphs:
-                para = []
-                for paragraph in result.paragraphs:
-                    if paragraph.content:
-                        para.append(paragraph.content.strip())
-                doc_text.append("\n".join(para))
-            
-            # Extract key-value pairs from the result
-            if result.key_value_pairs:
-                kv = []
-                for kvp in result.key_value_pairs:
-                    if kvp.value and kvp.value.content.strip():
-                        kv.append(f"{kvp.key.content.strip()}: {kvp.value.content.strip()}")
-                doc_text.append("\n".join(kv))
-
-            # Extract tables from the result
-            if result.tables:
-                tbl = []
-                for table in result.tables:
-                    flat_table = flatten_table(table)
-                    if flat_table:
-                        tbl.append(flat_table)
-                doc_text.append("\n".join(tbl))
-            # Combine all extracted text into a single string
-            full_text = "\n\n".join(doc_text)
-            
-            # Save the extracted text to a file
-            output_filename = urlparse(sas_url).path.split('/')[-1].split('.')[0] + ".txt"
-            output_path = os.path.join("extracted", output_filename)
-            os.makedirs("extracted", exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(full_text)
-                logger.info(f"✅ Successfully processed file: {output_filename} and saved to {output_path}")
-    
-    except Exception as e:
-        logger.error(f"❌ Failed to process file: {e}")
\ No newline at end of file
+    # Ensure the output folder exists and if not, create it
+    os.makedirs(output_folder, exist_ok=True)
+
+    # Start the analysis process
+    for sas_url in sas_urls:
+        try:
+            process_blob_url(sas_url, output_folder)
+        except Exception as e:
+            logger.error("❌ Failed to process file: %s", e)
@@ -0,0 +1,213 @@
+'''
+Module for running the ingestion pipeline as concurrent stages connected by bounded queues.
+Each document flows through: extract (from a blob SAS URL) -> chunk -> embed -> store.
+Stages run in their own threads (extraction with a worker pool), so Form Recognizer calls overlap
+with chunking and embedding of documents that are already done. Chunking is CPU-bound, so it is
+handed to a pool of worker processes to use all cores.
+Bounded queues between the stages apply back-pressure, so a fast stage cannot run far ahead of a slow one.
+'''
+
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List
+from urllib.parse import urlparse
+
+import numpy as np
+
+from app.ingestion.blob_reader import generate_sas_url
+from app.ingestion.text_extractor import extract_text_from_url
+from app.preprocessing.chunker import clean_and_chunk
+from app.embeddings.embedder import get_embeddings, store_in_azure_ai_search, store_in_local_faiss
+
+# Import pipeline configuration settings
+from config.azure_config import (PIPELINE_QUEUE_SIZE, PIPELINE_EXTRACT_WORKERS,
+                                 PIPELINE_EMBED_BATCH_SIZE, PIPELINE_UPSERT_BATCH_SIZE, CHUNKER_MAX_WORKERS,
+                                 AZURE_OPENAI_EMBEDDING_BATCH_SIZE, AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY)
+
+# Set up logging
+from config.logging_config import setup_logging
+logger = setup_logging('pipeline')
+
+# Marker put on a queue once its producer has finished
+_DONE = object()
+
+def _feed(items: Iterable, out_q: queue.Queue):
+    '''Put every item of an iterable on a queue, followed by the end marker.
+    Args:
+        items (Iterable): The items to enqueue.
+        out_q (queue.Queue): The queue to feed.
+    '''
+    try:
+        for item in items:
+            out_q.put(item)
+    except Exception as e:
+        logger.error(f"❌ Failed to list pipeline inputs: {e}")
+    finally:
+        out_q.put(_DONE)
+
+def _run_stage(name: str, worker: Callable[[object], list], in_q: queue.Queue, out_q: queue.Queue, num_workers: int,
+               describe: Callable[[object], str] = str):
+    '''Apply a worker function to every item of the input queue using a pool of threads.
+    Args:
+        name (str): Name of the stage, used in log messages.
+        worker (Callable[[object], list]): Function returning the list of outputs for one input item.
+        in_q (queue.Queue): Queue the stage consumes from.
+        out_q (queue.Queue): Queue the stage produces to; receives the end marker once all workers are done.
+        num_workers (int): Number of worker threads.
+        describe (Callable[[object], str]): Function returning a short identifier of an item for log messages.
+    '''
+    def work():
+        while True:
+            item = in_q.get()
+            if item is _DONE:
+                # Put the marker back so the other workers of this stage stop as well
+                in_q.put(_DONE)
+                return
+            try:
+                for result in worker(item):
+                    out_q.put(result)
+            except Exception as e:
+                logger.error("❌ Pipeline stage '%s' failed for %s: %s", name, describe(item), e)
+
+    with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix=name) as executor:
+        for _ in range(num_workers):
+            executor.submit(work)
+    out_q.put(_DONE)
+
+def _blob_name(sas_url: str) -> str:
+    '''Return the name of the blob a SAS URL points to, without the container and the SAS token.
+    Args:
+        sas_url (str): SAS URL of the blob.
+    Returns:
+        str: The blob name, including any virtual folders.
+    '''
+    return urlparse(sas_url).path.split("/", 2)[-1]
+
+def _extract_document(sas_url: str) -> List[tuple]:
+    '''Extract the text of one document straight from blob storage.
+    The text is passed on in memory, so no temporary file is written.
+    Args:
+        sas_url (str): SAS URL of the document.
+    Returns:
+        List[tuple]: A single (blob name, extracted text) pair.
+    '''
+    return [(_blob_name(sas_url), extract_text_from_url(sas_url))]
+
+def _chunk_document(extracted: tuple, chunk_pool: ProcessPoolExecutor) -> List[str]:
+    '''Clean and chunk the text of one extracted document in a worker process.
+    Args:
+        extracted (tuple): The blob name and the extracted text of the document.
+        chunk_pool (ProcessPoolExecutor): The worker processes that do the chunking.
+    Returns:
+        List[str]: The text chunks of the document.
+    '''
+    blob_name, text = extracted
+    chunks = chunk_pool.submit(clean_and_chunk, text).result()
+    logger.info("✅ Chunked: %s → %d chunks", blob_name, len(chunks))
+    return chunks
+
+def _embed_stage(in_q: queue.Queue, out_q: queue.Queue, use_azure: bool):
+    '''Group incoming chunks into micro-batches and embed each batch.
+    With Azure OpenAI a micro-batch holds AZURE_OPENAI_EMBEDDING_BATCH_SIZE * AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY
+    chunks, so its requests run concurrently; the local model uses PIPELINE_EMBED_BATCH_SIZE.
+    Args:
+        in_q (queue.Queue): Queue of text chunks.
+        out_q (queue.Queue): Queue receiving (chunks, embeddings) pairs.
+        use_azure (bool): Flag to determine whether to use Azure OpenAI for embeddings.
+    '''
+    def flush(batch: List[str]):
+        try:
+            out_q.put((batch, get_embeddings(chunks=batch, use_azure=use_azure)))
+        except Exception as e:
+            logger.error("❌ Failed to embed a batch of %d chunks: %s", len(batch), e)
+
+    # Azure OpenAI micro-batches are large enough to fill every concurrent request of one get_embeddings call
+    batch_size = (AZURE_OPENAI_EMBEDDING_BATCH_SIZE * AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY
+                  if use_azure else PIPELINE_EMBED_BATCH_SIZE)
+    batch = []
+    while (chunk := in_q.get()) is not _DONE:
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    out_q.put(_DONE)
+
+def _store_stage(in_q: queue.Queue, use_azure: bool) -> int:
+    '''Store embedded chunks, uploading to Azure AI Search in batches or building the local FAISS index at the end.
+    Args:
+        in_q (queue.Queue): Queue of (chunks, embeddings) pairs.
+        use_azure (bool): Flag to determine whether to use Azure AI Search for storage.
+    Returns:
+        int: Number of chunks stored; for Azure AI Search, only the documents the service accepted.
+    '''
+    pending_chunks, pending_embeddings = [], []
+    # Chunks handed to the store (used for unique document ids) and chunks actually stored
+    submitted = stored = 0
+
+    def flush():
+        nonlocal submitted, stored, pending_chunks, pending_embeddings
+        chunks, embeddings = pending_chunks, np.vstack(pending_embeddings)
+        pending_chunks, pending_embeddings = [], []
+        if use_azure:
+            stored += store_in_azure_ai_search(chunks, embeddings, start_id=submitted)
+        else:
+            store_in_local_faiss(chunks, embeddings)
+            stored += len(chunks)
+        submitted += len(chunks)
+
+    while (item := in_q.get()) is not _DONE:
+        chunks, embeddings = item
+        pending_chunks.extend(chunks)
+        pending_embeddings.append(embeddings)
+        # Azure AI Search is upserted in large batches as data arrives; the local FAISS index is
+        # trained on the whole corpus, so it is built once after the last batch
+        if use_azure and len(pending_chunks) >= PIPELINE_UPSERT_BATCH_SIZE:
+            flush()
+    if pending_chunks:
+        flush()
+    return stored
+
+def run_pipeline(container_name: str, use_azure: bool = False, expiry_hours: int = 1) -> int:
+    '''Ingest all documents of a blob container into the vector store as a concurrent, streaming pipeline.
+    Documents are analyzed by Form Recognizer straight from blob storage through SAS URLs, without a local download,
+    and their text is passed between the stages in memory.
+    Args:
+        container_name (str): The name of the Azure Blob Storage container.
+        use_azure (bool): Flag to determine whether to use Azure services or local models and storage.
+        expiry_hours (int): The number of hours until the SAS URLs expire; must cover the whole run.
+    Returns:
+        int: Number of chunks stored in the vector store.
+    '''
+    sas_urls = generate_sas_url(container_name=container_name, expiry_hours=expiry_hours)
+
+    # Bounded queues between consecutive stages
+    url_q, text_q, chunk_q, embedded_q = (queue.Queue(maxsize=PIPELINE_QUEUE_SIZE) for _ in range(4))
+
+    # One chunking thread per worker process; each thread waits on its document in the pool.
+    # The workers are started with "spawn" rather than forked: they start while the other stage threads
+    # (HTTP clients, the embedding model, SQLite) are running, and forking a multi-threaded process can
+    # leave locks held in the child
+    with ProcessPoolExecutor(max_workers=CHUNKER_MAX_WORKERS,
+                             mp_context=multiprocessing.get_context("spawn")) as chunk_pool:
+        stages = [
+            threading.Thread(target=_feed, args=(sas_urls, url_q)),
+            threading.Thread(target=_run_stage, args=("extract", _extract_document, url_q, text_q,
+                                                      PIPELINE_EXTRACT_WORKERS, _blob_name)),
+            threading.Thread(target=_run_stage, args=("chunk", lambda extracted: _chunk_document(extracted, chunk_pool),
+                                                      text_q, chunk_q, CHUNKER_MAX_WORKERS, lambda extracted: extracted[0])),
+            threading.Thread(target=_embed_stage, args=(chunk_q, embedded_q, use_azure)),
+        ]
+        for stage in stages:
+            stage.start()
+
+        # The store stage runs in the calling thread and finishes once every upstream stage has drained
+        stored = _store_stage(embedded_q, use_azure)
+        for stage in stages:
+            stage.join()
+
+    logger.info(f"✅ Pipeline stored {stored} chunks from container '{container_name}'")
+    return stored
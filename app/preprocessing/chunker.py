@@ -1,32 +1,55 @@
 '''
 Module for chunking text files into manageable pieces.
-This module reads text files, cleans the text, and splits it into chunks based on a maximum token count.
+This module cleans extracted text and splits it into chunks based on a maximum token count.
 '''
 
-import os
 import logging
-from nltk.tokenize import sent_tokenize
+from collections import deque
+from typing import List
+
+# Sentence splitting: blingfire's compiled splitter when available, NLTK's Punkt tokenizer otherwise
+try:
+    import blingfire
+except ImportError:
+    blingfire = None
+    from nltk.tokenize import PunktTokenizer
 
 # Set up logging
 from config.logging_config import setup_logging
 logger = setup_logging('chunker')
 
+# Load the Punkt model once instead of on every call
+_PUNKT = PunktTokenizer() if blingfire is None else None
+
+def split_sentences(text: str) -> List[str]:
+    '''Splits text into sentences.
+    Args:
+        text (str): The text to be split.
+    Returns:
+        List[str]: The sentences of the text.
+    '''
+    if blingfire is not None:
+        # text_to_sentences returns one sentence per line
+        return [sentence for sentence in blingfire.text_to_sentences(text).split("\n") if sentence]
+    return _PUNKT.tokenize(text)
+
 def chunk_text(text: str, max_tokens: int = 500, overlap: int = 100) -> list:
     '''Splits text into chunks of approximately max_tokens, allowing for overlap.
+    Chunks are built from whole sentences; a single sentence longer than max_tokens becomes a chunk on its own.
     Args:
         text (str): The text to be chunked.
         max_tokens (int): Maximum number of tokens per chunk.
-        overlap (int): Number of tokens to overlap between chunks.
+        overlap (int): Maximum number of tokens (from the end of a chunk) repeated at the start of the next chunk.
     Returns:
         list: A list of text chunks.
     '''
     
     # Tokenize the text into sentences
-    sentences = sent_tokenize(text)
+    sentences = split_sentences(text)
 
-    # Initialize variables for chunking
+    # Initialize variables for chunking; the current chunk is a ring buffer of (sentence, token count) pairs
     chunks = []
-    current_chunk = []
+    current_chunk = deque()
     current_tokens = 0
 
     # Process each sentence and build chunks
@@ -34,20 +57,20 @@ def chunk_text(text: str, max_tokens: int = 500, overlap: int = 100) -> list:
         # Count tokens in the current sentence
         token_count = len(sentence.split())
 
-        # If adding this sentence leaves us under the max token limit, add it to the current chunk
-        if current_tokens + token_count <= max_tokens:
-            current_chunk.append(sentence)
-            current_tokens += token_count
-        # Else, finalize the current chunk and start a new one
-        else:
-            chunks.append(" ".join(current_chunk))
-            current_chunk = current_chunk[-overlap:]  # overlap with last few sentences
-            current_chunk.append(sentence)
-            current_tokens = sum(len(s.split()) for s in current_chunk)
+        # If adding this sentence would exceed the max token limit, finalize the current chunk
+        if current_chunk and current_tokens + token_count > max_tokens:
+            chunks.append(" ".join(s for s, _ in current_chunk))
+            # Drop sentences from the front until only `overlap` tokens are carried over,
+            # and the new sentence fits next to them
+            while current_chunk and (current_tokens > overlap or current_tokens + token_count > max_tokens):
+                current_tokens -= current_chunk.popleft()[1]
+
+        current_chunk.append((sentence, token_count))
+        current_tokens += token_count
 
     # If there's any remaining text in the current chunk, add it to the list of chunks
     if current_chunk:
-        chunks.append(" ".join(current_chunk))
+        chunks.append(" ".join(s for s, _ in current_chunk))
 
     return chunks
 
@@ -64,36 +87,11 @@ def clean_text(text: str) -> str:
     return cleaned
 
 
-def process_extracted_files(input_folder: str) -> dict:
-    '''Processes all text files in the input folder, cleaning and chunking them.
+def clean_and_chunk(text: str) -> list:
+    '''Cleans and chunks the text of one document. Runs in a worker process of the ingestion pipeline.
     Args:
-        input_folder (str): Path to the folder containing text files.
+        text (str): The extracted text of the document.
     Returns:
-        dict: A dictionary where keys are filenames and values are lists of text chunks.
+        list: A list of text chunks.
     '''
-    # Define the output variable in from of dictionary to hold all chunks
-    all_chunks = {}
-
-    # Process each text file in the input folder
-    for filename in os.listdir(input_folder):
-        # Only process .txt files
-        if filename.endswith(".txt"):
-            # Construct the full path to the file
-            path = os.path.join(input_folder, filename)
-            # Read the file content
-            with open(path, "r", encoding="utf-8") as f:
-                text = f.read()
-
-            # Clean and chunk the text
-            cleaned = clean_text(text)
-            chunks = chunk_text(cleaned)
-
-            # Store the chunks in the dictionary
-            all_chunks[filename] = chunks
-            logger.info(f"✅ Chunked: {filename} → {len(chunks)} chunks")
-
-            # Delete the original file after processing
-            os.remove(path)
-            logger.info(f"🗑️ Deleted: {filename}")
-
-    return all_chunks
\ No newline at end of file
+    return chunk_text(clean_text(text))
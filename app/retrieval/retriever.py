@@ -1,19 +1,28 @@
 '''
 Module for retrieving top-k chunks from either Azure AI Search or a local FAISS index.
 '''
-import pickle
+import os
+import asyncio
+import sqlite3
+import threading
 import numpy as np
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Awaitable, Iterator, List
 
 # Azure Search
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
+from azure.search.documents.models import VectorizedQuery
 from azure.core.credentials import AzureKeyCredential
 
 # FAISS
 import faiss
 
 # Import configuration settings for Azure OpenAI and Search
-from config.azure_config import (AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_ADMIN_KEY, AZURE_SEARCH_INDEX_NAME, LOCAL_VECTOR_DB_DIRECTORY)
+from config.azure_config import (AZURE_SEARCH_ENDPOINT, AZURE_SEARCH_ADMIN_KEY, AZURE_SEARCH_INDEX_NAME, LOCAL_VECTOR_DB_DIRECTORY, LOCAL_FAISS_NPROBE,
+                                 LOCAL_FAISS_USE_GPU, LOCAL_FAISS_NUM_THREADS,
+                                 AZURE_SEARCH_MAX_CONCURRENT_QUERIES)
 
 # Embedding
 from app.embeddings.embedder import get_embeddings
@@ -22,6 +31,75 @@ from app.embeddings.embedder import get_embeddings
 from config.logging_config import setup_logging
 logger = setup_logging('retriever')
 
+# Threads FAISS spreads CPU searches over; lower it when several processes share the machine
+faiss.omp_set_num_threads(LOCAL_FAISS_NUM_THREADS)
+
+# Files of the local vector store, as written by store_in_local_faiss
+_INDEX_PATH = os.path.join(LOCAL_VECTOR_DB_DIRECTORY, "faiss.index")
+_CHUNKS_PATH = os.path.join(LOCAL_VECTOR_DB_DIRECTORY, "chunks.sqlite")
+
+@lru_cache(maxsize=1)
+def _get_search_client() -> SearchClient:
+    '''
+    Create the Azure AI Search client once so its HTTP connections are reused across queries.
+    Returns:
+        SearchClient: The shared Azure AI Search client.
+    '''
+    return SearchClient(
+        endpoint=AZURE_SEARCH_ENDPOINT,
+        index_name=AZURE_SEARCH_INDEX_NAME,
+        credential=AzureKeyCredential(AZURE_SEARCH_ADMIN_KEY)
+    )
+
+def _create_async_search_client() -> AsyncSearchClient:
+    '''
+    Create an async Azure AI Search client. Its connection pool is bound to the running event loop,
+    so it is opened per event loop (with "async with") rather than cached for the process.
+    Returns:
+        AsyncSearchClient: A new async Azure AI Search client.
+    '''
+    return AsyncSearchClient(
+        endpoint=AZURE_SEARCH_ENDPOINT,
+        index_name=AZURE_SEARCH_INDEX_NAME,
+        credential=AzureKeyCredential(AZURE_SEARCH_ADMIN_KEY)
+    )
+
+def _vector_query(query_embedding: List[float], k: int) -> VectorizedQuery:
+    '''
+    Build the vector query for the embedding field of the index.
+    Args:
+        query_embedding (List[float]): The embedding vector for the query.
+        k (int): The number of top results to return.
+    Returns:
+        VectorizedQuery: The typed vector query, so a misspelled key cannot silently drop the vector field.
+    '''
+    # Convert query_embedding to a list if it's a numpy array
+    return VectorizedQuery(vector=np.asarray(query_embedding, dtype=float).tolist(),
+                           k_nearest_neighbors=k, fields="embedding")
+
+def _iter_chunks_azure(query_embedding: List[float], k: int) -> Iterator[str]:
+    '''
+    Yields the top-k chunks from Azure AI Search in rank order, as the result pages are read.
+    Args:
+        query_embedding (List[float]): The embedding vector for the query.
+        k (int): The number of top results to return.
+    Yields:
+        str: The next best matching chunk.
+    '''
+    if k <= 0:
+        return
+    # Get the shared Azure Search client
+    client = _get_search_client()
+
+    results = client.search(
+        search_text=None,
+        vector_queries=[_vector_query(query_embedding, k)],
+        select=["content"],  # Assuming 'content' is the field containing the text chunks
+    )
+
+    for doc in results:
+        yield doc['content']
+
 def search_chunks_azure(query_embedding: List[float], k: int) -> List[str]:
     '''
     Searches for top-k chunks in Azure AI Search using the provided query embedding.
@@ -32,29 +110,275 @@ def search_chunks_azure(query_embedding: List[float], k: int) -> List[str]:
         List[str]: A list of top-k chunks retrieved from Azure AI Search.
     '''
     try:
-        # Set up Azure Search client
-        client = SearchClient(
-            endpoint=AZURE_SEARCH_ENDPOINT,
-            index_name=AZURE_SEARCH_INDEX_NAME,
-            credential=AzureKeyCredential(AZURE_SEARCH_ADMIN_KEY)
-        )
-        
-        # Convert query_embedding to a list if it's a numpy array
-        results = client.search(
+        return list(_iter_chunks_azure(query_embedding, k))
+    except Exception as e:
+        logger.exception("Azure retrieval failed: %s", e)
+        return []
+
+async def search_chunks_azure_async(query_embedding: List[float], k: int, client: AsyncSearchClient = None) -> List[str]:
+    '''
+    Async variant of search_chunks_azure, so several searches can run concurrently with asyncio.gather.
+    Args:
+        query_embedding (List[float]): The embedding vector for the query.
+        k (int): The number of top results to return.
+        client (AsyncSearchClient): An open async client to reuse; a temporary one is created if not given.
+    Returns:
+        List[str]: A list of top-k chunks retrieved from Azure AI Search.
+    '''
+    if k <= 0:
+        return []
+    if client is None:
+        async with _create_async_search_client() as client:
+            return await search_chunks_azure_async(query_embedding, k, client)
+    try:
+        results = await client.search(
             search_text=None,
-            vector_queries=[{'kind': 'vector',
-                             'vector': query_embedding,
-                             'fields': 'embedding',
-                             'k': k}],
+            vector_queries=[_vector_query(query_embedding, k)],
             select=["content"],  # Assuming 'content' is the field containing the text chunks
         )
-
-        return [doc['content'] for doc in results]
+        return [doc['content'] async for doc in results]
 
     except Exception as e:
-        logger.error(f"Azure retrieval failed: {e}")
+        logger.exception("Azure retrieval failed: %s", e)
         return []
 
+async def search_chunks_azure_batch(query_embeddings: np.ndarray, k: int,
+                                    max_concurrency: int = AZURE_SEARCH_MAX_CONCURRENT_QUERIES) -> List[List[str]]:
+    '''
+    Searches for top-k chunks for several queries concurrently in Azure AI Search, over one async client.
+    Args:
+        query_embeddings (np.ndarray): Matrix with one query embedding per row.
+        k (int): The number of top results to return per query.
+        max_concurrency (int): Maximum number of search requests in flight at once, to avoid throttling.
+    Returns:
+        List[List[str]]: For each query, in request order, a list of top-k chunks retrieved from Azure AI Search.
+    '''
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async with _create_async_search_client() as client:
+        async def _search(query_embedding):
+            async with semaphore:
+                return await search_chunks_azure_async(query_embedding, k, client)
+
+        results = await asyncio.gather(*[_search(embedding) for embedding in query_embeddings], return_exceptions=True)
+
+    # gather keeps request order; a failed query yields no chunks instead of failing the whole batch
+    return [[] if isinstance(result, Exception) else result for result in results]
+
+@lru_cache(maxsize=1)
+def _get_gpu_resources():
+    '''
+    Create the FAISS GPU resources (cuBLAS handles, temporary memory) once for all GPU indexes.
+    Returns:
+        faiss.StandardGpuResources: The shared GPU resources.
+    '''
+    return faiss.StandardGpuResources()
+
+def _index_to_gpu(index: faiss.Index) -> faiss.Index:
+    '''
+    Copy a FAISS index to the first GPU, if FAISS was built with GPU support and a GPU is present.
+    GPU search mainly pays off for batches of queries; single queries are often faster on CPU.
+    Args:
+        index (faiss.Index): The CPU index.
+    Returns:
+        faiss.Index: The GPU index, or the CPU index if it cannot be moved to a GPU.
+    '''
+    if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+        logger.warning("LOCAL_FAISS_USE_GPU is set but no FAISS GPU support is available; searching on CPU")
+        return index
+    try:
+        gpu_index = faiss.index_cpu_to_gpu(_get_gpu_resources(), 0, index)
+    except RuntimeError as e:
+        # Not every index type has a GPU implementation (e.g. a plain scalar quantizer)
+        logger.warning("Index cannot be moved to GPU, searching on CPU: %s", e)
+        return index
+
+    # Run one dummy search so kernel and handle setup is not paid by the first real query
+    gpu_index.search(np.zeros((1, gpu_index.d), dtype=np.float32), 1)
+    logger.info("Moved local FAISS index to GPU")
+    return gpu_index
+
+def _read_index(index_path: str) -> faiss.Index:
+    '''
+    Read the FAISS index, memory-mapping its data where the index type supports it so that only the
+    inverted lists touched by queries become resident, instead of copying the whole index into RAM.
+    Args:
+        index_path (str): Path of the FAISS index file.
+    Returns:
+        faiss.Index: The loaded index.
+    '''
+    # A GPU copy needs the full index in host memory anyway
+    if not LOCAL_FAISS_USE_GPU:
+        try:
+            return faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as e:
+            logger.info("Index cannot be memory-mapped, reading it into memory: %s", e)
+    return faiss.read_index(index_path)
+
+def _fetch_chunks(conn: sqlite3.Connection, ids: List[int]) -> dict:
+    '''
+    Fetch chunk texts by id from the chunk mapping.
+    Args:
+        conn (sqlite3.Connection): Connection to the chunk mapping.
+        ids (List[int]): The chunk ids to fetch.
+    Returns:
+        dict: Mapping of chunk id to chunk text.
+    '''
+    chunks = {}
+    # Query in slices to stay below SQLite's limit on bound parameters
+    for start in range(0, len(ids), 500):
+        batch = ids[start:start + 500]
+        rows = conn.execute(f"SELECT id, text FROM chunks WHERE id IN ({','.join('?' * len(batch))})", batch)
+        chunks.update(rows.fetchall())
+    return chunks
+
+class LocalRetriever:
+    '''
+    Searches the local FAISS index and reads the matched chunks from the SQLite chunk mapping.
+    The index and the mapping are loaded once when the retriever is created, so a search does no setup work.
+    Searches raise on failure; the module-level functions decide how errors are reported.
+    '''
+    def __init__(self, index_path: str, chunks_path: str):
+        '''
+        Load the FAISS index and open the chunk mapping.
+        Args:
+            index_path (str): Path of the FAISS index file.
+            chunks_path (str): Path of the SQLite chunk mapping.
+        '''
+        index = _read_index(index_path)
+        # Queries are L2-normalized for cosine similarity, which only ranks correctly against an inner-product index
+        # built from normalized vectors; an index saved by an older version (L2 metric) has to be rebuilt
+        if index.metric_type != faiss.METRIC_INNER_PRODUCT:
+            logger.warning("Local FAISS index does not use the inner-product metric; rebuild it for cosine-similarity ranking")
+        try:
+            # Number of inverted lists visited per query (IVF indexes only)
+            faiss.extract_index_ivf(index).nprobe = LOCAL_FAISS_NPROBE
+        except RuntimeError:
+            pass
+        if LOCAL_FAISS_USE_GPU:
+            index = _index_to_gpu(index)
+        self.index = index
+
+        # The connection is shared by all callers; SQLite serializes access to it
+        self.conn = sqlite3.connect(f"file:{chunks_path}?mode=ro", uri=True, check_same_thread=False)
+        # Read the mapping through a memory map: pages holding the fetched chunks are faulted in on demand
+        # and shared with the OS page cache instead of being copied into SQLite's own cache
+        self.conn.execute(f"PRAGMA mmap_size = {os.path.getsize(chunks_path)}")
+
+        # Per-thread result buffers reused across searches
+        self._buffers = threading.local()
+        logger.info("Loaded local FAISS index with %d vectors", index.ntotal)
+
+    def _search(self, query_embeddings: np.ndarray, k: int) -> np.ndarray:
+        '''
+        Run one FAISS search for all queries, writing into this thread's preallocated result buffers,
+        grown only when a larger batch or k is requested, instead of allocating new distance and id arrays per call.
+        Args:
+            query_embeddings (np.ndarray): Matrix with one query embedding per row (or a single vector).
+            k (int): The number of results per query.
+        Returns:
+            np.ndarray: The (n, k) matrix of result ids, padded with -1; a view of the buffer that is only
+            valid until the next search on the same thread.
+        '''
+        # The index stores L2-normalized vectors, so normalize the queries the same way for cosine similarity.
+        # This is the only copy on the query path (C-contiguous float32, as FAISS expects), so the caller's
+        # embeddings are not normalized in place.
+        query_vectors = np.array(query_embeddings, dtype=np.float32, order="C", ndmin=2)
+        faiss.normalize_L2(query_vectors)
+
+        size = len(query_vectors) * k
+        buffers = getattr(self._buffers, "buffers", None)
+        if buffers is None or buffers[0].size < size:
+            buffers = self._buffers.buffers = (np.empty(size, dtype=np.float32), np.empty(size, dtype=np.int64))
+        # Views of the start of the flat buffers are contiguous, as FAISS requires
+        distances = buffers[0][:size].reshape(-1, k)
+        indices = buffers[1][:size].reshape(-1, k)
+        self.index.search(query_vectors, k, D=distances, I=indices)
+        return indices
+
+    def search_batch(self, query_embeddings: np.ndarray, k: int) -> List[List[str]]:
+        '''
+        Search top-k chunks for several queries with a single FAISS search call.
+        Args:
+            query_embeddings (np.ndarray): Matrix with one query embedding per row.
+            k (int): The number of top results to return per query.
+        Returns:
+            List[List[str]]: For each query, a list of top-k chunks.
+        '''
+        if k <= 0 or len(query_embeddings) == 0:
+            return [[] for _ in range(len(query_embeddings))]
+        indices = self._search(query_embeddings, k)
+
+        # Fetch only the matched chunks from the mapping; FAISS pads missing results with -1
+        chunks = _fetch_chunks(self.conn, sorted({int(i) for row in indices for i in row if i != -1}))
+        return [[chunks[int(i)] for i in row if i != -1] for row in indices]
+
+    def search(self, query_embedding: List[float], k: int) -> List[str]:
+        '''
+        Search top-k chunks for one query.
+        Args:
+            query_embedding (List[float]): The embedding vector for the query.
+            k (int): The number of top results to return.
+        Returns:
+            List[str]: A list of top-k chunks.
+        '''
+        # View the vector as a 1 x d float32 matrix; no copy when it already is a float32 array
+        query_vector = np.ascontiguousarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        return self.search_batch(query_vector, k)[0]
+
+    def iter_search(self, query_embedding: List[float], k: int) -> Iterator[str]:
+        '''
+        Yield top-k chunks for one query in rank order, reading each chunk from the mapping only when it is requested.
+        Args:
+            query_embedding (List[float]): The embedding vector for the query.
+            k (int): The number of top results to return.
+        Yields:
+            str: The next best matching chunk.
+        '''
+        if k <= 0:
+            return
+        # Copy the ids out of the shared result buffer, which the next search on this thread overwrites
+        ids = [int(i) for i in self._search(query_embedding, k)[0] if i != -1]
+        for i in ids:
+            yield self.conn.execute("SELECT text FROM chunks WHERE id = ?", (i,)).fetchone()[0]
+
+@lru_cache(maxsize=1)
+def _load_local_retriever(index_path: str, index_mtime: float, chunks_path: str, chunks_mtime: float) -> LocalRetriever:
+    '''
+    Create the local retriever once; cached until the index or the chunk mapping changes on disk.
+    Args:
+        index_path (str): Path of the FAISS index file.
+        index_mtime (float): Modification time of the index file, part of the cache key.
+        chunks_path (str): Path of the SQLite chunk mapping.
+        chunks_mtime (float): Modification time of the chunk mapping, part of the cache key.
+    Returns:
+        LocalRetriever: The retriever over the local vector store.
+    '''
+    return LocalRetriever(index_path, chunks_path)
+
+def _get_local_retriever() -> LocalRetriever:
+    '''
+    Return the cached local retriever, reloading it if the vector store was rebuilt since the last query.
+    Returns:
+        LocalRetriever: The retriever over the local vector store.
+    '''
+    return _load_local_retriever(_INDEX_PATH, os.path.getmtime(_INDEX_PATH), _CHUNKS_PATH, os.path.getmtime(_CHUNKS_PATH))
+
+def search_chunks_local_batch(query_embeddings: np.ndarray, k: int) -> List[List[str]]:
+    '''
+    Searches for top-k chunks for several queries at once with a single FAISS search call.
+    Args:
+        query_embeddings (np.ndarray): Matrix with one query embedding per row.
+        k (int): The number of top results to return per query.
+    Returns:
+        List[List[str]]: For each query, a list of top-k chunks retrieved from the local FAISS index.
+    '''
+    try:
+        return _get_local_retriever().search_batch(query_embeddings, k)
+    except Exception as e:
+        logger.exception("Local FAISS retrieval failed: %s", e)
+        return [[] for _ in range(len(query_embeddings))]
+
 def search_chunks_local(query_embedding: List[float], k: int) -> List[str]:
     '''
     Searches for top-k chunks in a local FAISS index using the provided query embedding.
@@ -64,21 +388,79 @@ def search_chunks_local(query_embedding: List[float], k: int) -> List[str]:
     Returns:
         List[str]: A list of top-k chunks retrieved from the local FAISS index.
     '''
-    dir = LOCAL_VECTOR_DB_DIRECTORY
     try:
-        index = faiss.read_index(f"{dir}/faiss.index")
+        return _get_local_retriever().search(query_embedding, k)
+    except Exception as e:
+        logger.exception("Local FAISS retrieval failed: %s", e)
+        return []
 
-        with open(f"{dir}/id_to_chunk.pkl", "rb") as f:
-            chunks = pickle.load(f)
+def _normalize_query(query: str) -> str:
+    '''
+    Normalize query text before embedding, so trivially different spellings of a query share one cached embedding.
+    Whitespace is collapsed; case is kept, since cased embedding models give different vectors for different casing.
+    Args:
+        query (str): The input query.
+    Returns:
+        str: The normalized query; empty for a blank query.
+    '''
+    return " ".join(query.split())
 
-        query_vector = np.array([query_embedding]).astype('float32')
-        _, indices = index.search(query_vector, k)
+def _call_outside_event_loop(func, *args):
+    '''
+    Call a blocking retrieval function, moving it to a worker thread when called from a running event loop,
+    because the batched Azure search starts its own event loop with asyncio.run.
+    Args:
+        func: The function to call.
+        *args: Its arguments.
+    Returns:
+        The function's result.
+    '''
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return func(*args)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(func, *args).result()
 
-        return [chunks[i] for i in indices[0]]
+@lru_cache(maxsize=4096)
+def _embed_query_cached(query: str, use_azure: bool) -> np.ndarray:
+    '''
+    Embed a single query, keeping recent query embeddings in memory so repeated questions skip the embedding call.
+    Args:
+        query (str): The normalized query text.
+        use_azure (bool): Flag to determine whether to use Azure OpenAI or the local model.
+    Returns:
+        np.ndarray: The query embedding, read-only because it is shared by every caller of the same query.
+    '''
+    embedding = get_embeddings(chunks=[query], use_azure=use_azure)[0]
+    embedding.flags.writeable = False
+    return embedding
 
-    except Exception as e:
-        logger.error(f"Local FAISS retrieval failed: {e}")
-        return []
+def iter_top_k_chunks(query: str, k: int = 3, use_azure: bool = False) -> Iterator[str]:
+    '''
+    Lazily yields the top-k similar chunks to the input query, best match first, from either Azure AI Search
+    or FAISS (local). Chunks are only fetched as they are consumed, so a caller that stops early
+    (e.g. a reranker or a prompt with a size budget) does not pay for the rest.
+    Args:
+        query (str): The input query for which to find similar chunks.
+        k (int): The number of top results to return.
+        use_azure (bool): Flag to determine whether to use Azure services or local model.
+    Yields:
+        str: The next most similar chunk; nothing for a blank query or k <= 0.
+    Raises:
+        Exception: If embedding the query or the search fails.
+    '''
+    query = _normalize_query(query)
+    # Nothing to retrieve, so skip the embedding call and the search
+    if not query or k <= 0:
+        return
+
+    embedding = _embed_query_cached(query, use_azure)
+    logger.info("Query embedding: %d dimensions", len(embedding))
+    if use_azure:
+        yield from _iter_chunks_azure(embedding, k)
+    else:
+        yield from _get_local_retriever().iter_search(embedding, k)
 
 def get_top_k_chunks(query: str, k: int = 3, use_azure: bool = False) -> List[str]:
     '''
@@ -88,11 +470,98 @@ def get_top_k_chunks(query: str, k: int = 3, use_azure: bool = False) -> List[st
         k (int): The number of top results to return.
         use_azure (bool): Flag to determine whether to use Azure services or local model.
     Returns:
-        List[str]: A list of top-k chunks similar to the input query.
+        List[str]: A list of top-k chunks similar to the input query; empty for a blank query or k <= 0.
     '''
-    embedding = get_embeddings(chunks=[query], use_azure=use_azure)[0]
-    logger.info(f"Query embedding: {len(embedding)} dimensions")
+    # Errors are handled once here rather than inside every search step
+    try:
+        return list(iter_top_k_chunks(query, k, use_azure))
+    except Exception as e:
+        logger.exception("Retrieval failed: %s", e)
+        return []
+
+async def get_top_k_chunks_async(query: str, k: int = 3, use_azure: bool = False, ready: Awaitable = None) -> List[str]:
+    '''
+    Async variant of get_top_k_chunks. The query is embedded in a worker thread while `ready` (e.g. the
+    ingestion of new documents) is still running, and the search starts once it has completed.
+    Args:
+        query (str): The input query for which to find similar chunks.
+        k (int): The number of top results to return.
+        use_azure (bool): Flag to determine whether to use Azure services or local model.
+        ready (Awaitable): Optional awaitable that must complete before the index is searched.
+    Returns:
+        List[str]: A list of top-k chunks similar to the input query; empty for a blank query or k <= 0,
+            and empty if retrieval fails. An exception raised by `ready` is propagated.
+    '''
+    query = _normalize_query(query)
+    if not query or k <= 0:
+        if ready is not None:
+            await ready
+        return []
+
+    # Blocking embedding call goes to a thread and starts before `ready` is awaited
+    embedding_task = asyncio.ensure_future(asyncio.to_thread(_embed_query_cached, query, use_azure))
+    if ready is not None:
+        # A failure of `ready` belongs to the caller, not to retrieval, so it is re-raised as is
+        try:
+            await ready
+        except BaseException:
+            embedding_task.cancel()
+            raise
+
+    # Errors are handled once here, as in get_top_k_chunks
+    try:
+        embedding = await embedding_task
+        logger.info("Query embedding: %d dimensions", len(embedding))
+        if use_azure:
+            return await search_chunks_azure_async(embedding, k)
+        else:
+            return await asyncio.to_thread(search_chunks_local, embedding, k)
+    except Exception as e:
+        logger.exception("Retrieval failed: %s", e)
+        return []
+
+def get_top_k_chunks_batch(queries: List[str], k: int = 3, use_azure: bool = False) -> List[List[str]]:
+    '''
+    Retrieves top-k similar chunks for several queries, embedding all queries in one call and
+    searching them together: concurrently in Azure AI Search, or with one FAISS call for the local index.
+    Args:
+        queries (List[str]): The input queries for which to find similar chunks.
+        k (int): The number of top results to return per query.
+        use_azure (bool): Flag to determine whether to use Azure services or local model.
+    Returns:
+        List[List[str]]: For each query, a list of top-k chunks similar to it; empty for a blank query or k <= 0,
+            and empty for every query if retrieval fails.
+    '''
+    # Errors are handled once here, as in get_top_k_chunks
+    try:
+        return _call_outside_event_loop(_search_top_k_batch, queries, k, use_azure)
+    except Exception as e:
+        logger.exception("Batch retrieval failed: %s", e)
+        return [[] for _ in queries]
+
+def _search_top_k_batch(queries: List[str], k: int, use_azure: bool) -> List[List[str]]:
+    '''
+    Embed and search several queries; see get_top_k_chunks_batch. Raises if embedding fails.
+    Args:
+        queries (List[str]): The input queries for which to find similar chunks.
+        k (int): The number of top results to return per query.
+        use_azure (bool): Flag to determine whether to use Azure services or local model.
+    Returns:
+        List[List[str]]: For each query, a list of top-k chunks similar to it.
+    '''
+    # Embed and search only the non-blank queries
+    queries = [_normalize_query(query) for query in queries]
+    results = [[] for _ in queries]
+    positions = [i for i, query in enumerate(queries) if query]
+    if not positions or k <= 0:
+        return results
+
+    embeddings = get_embeddings(chunks=[queries[i] for i in positions], use_azure=use_azure)
+    logger.info("Query embeddings: %d x %d dimensions", *embeddings.shape)
     if use_azure:
-        return search_chunks_azure(embedding, k)
+        found = asyncio.run(search_chunks_azure_batch(embeddings, k))
     else:
-        return search_chunks_local(embedding, k)
\ No newline at end of file
+        found = search_chunks_local_batch(embeddings, k)
+    for i, chunks in zip(positions, found):
+        results[i] = chunks
+    return results
@@ -13,13 +13,18 @@ load_dotenv()
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 AZURE_FORM_RECOGNIZER_ENDPOINT = os.getenv("AZURE_FORM_RECOGNIZER_ENDPOINT")
 AZURE_FORM_RECOGNIZER_KEY = os.getenv("AZURE_FORM_RECOGNIZER_KEY")
+AZURE_FORM_RECOGNIZER_MAX_WORKERS = int(os.getenv("AZURE_FORM_RECOGNIZER_MAX_WORKERS", 8))
 AZURE_STORAGE_ACCOUNT_KEY = os.getenv("AZURE_STORAGE_ACCOUNT_KEY")
+AZURE_STORAGE_MAX_CONCURRENT_DOWNLOADS = int(os.getenv("AZURE_STORAGE_MAX_CONCURRENT_DOWNLOADS", 16))
 
 # Azure OpenAI configuration
 AZURE_OPENAI_EMBEDDING_API_KEY = os.getenv("AZURE_OPENAI_EMBEDDING_API_KEY")
 AZURE_OPENAI_EMBEDDING_ENDPOINT = os.getenv("AZURE_OPENAI_EMBEDDING_ENDPOINT")
 AZURE_OPENAI_EMBEDDING_DEPLOYMENT = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
 AZURE_OPENAI_EMBEDDING_VERSION = os.getenv("AZURE_OPENAI_EMBEDDING_VERSION")
+AZURE_OPENAI_EMBEDDING_BATCH_SIZE = int(os.getenv("AZURE_OPENAI_EMBEDDING_BATCH_SIZE", 96))
+AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY = int(os.getenv("AZURE_OPENAI_EMBEDDING_MAX_CONCURRENCY", 5))
+AZURE_OPENAI_EMBEDDING_MAX_RETRIES = int(os.getenv("AZURE_OPENAI_EMBEDDING_MAX_RETRIES", 5))
 
 # Azure OpenAI Chat Completion configuration
 AZURE_OPENAI_CHAT_COMPLETION_API_KEY = os.getenv("AZURE_OPENAI_CHAT_COMPLETION_API_KEY")
@@ -31,9 +36,30 @@ AZURE_OPENAI_CHAT_COMPLETION_DEPLOYMENT = os.getenv("AZURE_OPENAI_CHAT_COMPLETIO
 AZURE_SEARCH_ENDPOINT = os.getenv("AZURE_SEARCH_ENDPOINT")
 AZURE_SEARCH_ADMIN_KEY = os.getenv("AZURE_SEARCH_ADMIN_KEY")
 AZURE_SEARCH_INDEX_NAME = os.getenv("AZURE_SEARCH_INDEX_NAME")
+AZURE_SEARCH_UPLOAD_BATCH_SIZE = int(os.getenv("AZURE_SEARCH_UPLOAD_BATCH_SIZE", 500))
+AZURE_SEARCH_UPLOAD_WORKERS = int(os.getenv("AZURE_SEARCH_UPLOAD_WORKERS", 4))
+AZURE_SEARCH_MAX_CONCURRENT_QUERIES = int(os.getenv("AZURE_SEARCH_MAX_CONCURRENT_QUERIES", 32))
 
 # Local embedding model configuration
 LOCAL_EMBEDDING_MODEL_NAME = os.getenv("LOCAL_EMBEDDING_MODEL_NAME","all-MiniLM-L6-v2")
+LOCAL_EMBEDDING_BACKEND = os.getenv("LOCAL_EMBEDDING_BACKEND", "torch")
+LOCAL_EMBEDDING_ONNX_FILE = os.getenv("LOCAL_EMBEDDING_ONNX_FILE")
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", 32))
 LOCAL_VECTOR_DB_DIRECTORY = os.getenv("LOCAL_VECTOR_DB_DIRECTORY", "vectorstore")
+# Local FAISS index configuration
+LOCAL_FAISS_INDEX_FACTORY = os.getenv("LOCAL_FAISS_INDEX_FACTORY", "auto")
+LOCAL_FAISS_FALLBACK_INDEX_FACTORY = os.getenv("LOCAL_FAISS_FALLBACK_INDEX_FACTORY", "SQ8")
+LOCAL_FAISS_NPROBE = int(os.getenv("LOCAL_FAISS_NPROBE", 16))
+LOCAL_FAISS_USE_GPU = os.getenv("LOCAL_FAISS_USE_GPU", "false").lower() == "true"
+LOCAL_FAISS_NUM_THREADS = int(os.getenv("LOCAL_FAISS_NUM_THREADS", os.cpu_count() or 1))
 # Local LLM model path
-LOCAL_LLM_MODEL_PATH = os.getenv("LOCAL_LLM_MODEL_PATH")
\ No newline at end of file
+LOCAL_LLM_MODEL_PATH = os.getenv("LOCAL_LLM_MODEL_PATH")
+
+# Chunking configuration
+CHUNKER_MAX_WORKERS = int(os.getenv("CHUNKER_MAX_WORKERS", os.cpu_count() or 1))
+
+# Ingestion pipeline configuration
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 64))
+PIPELINE_EXTRACT_WORKERS = int(os.getenv("PIPELINE_EXTRACT_WORKERS", 4))
+PIPELINE_EMBED_BATCH_SIZE = int(os.getenv("PIPELINE_EMBED_BATCH_SIZE", 64))
+PIPELINE_UPSERT_BATCH_SIZE = int(os.getenv("PIPELINE_UPSERT_BATCH_SIZE", 500))
\ No newline at end of file
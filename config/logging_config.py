@@ -3,7 +3,9 @@ Logging configuration module for setting up logging in Python applications.
 This module provides a function to set up logging with both file and console handlers, ensuring that logs are written in UTF-8 encoding.
 It creates a directory for logs if it does not exist and configures the logger with a specified name.'''
 import os
+import atexit
 import logging
+import logging.handlers
 from typing import List
 
 def setup_logging(name: str, log_dir: str = 'logs') -> logging.Logger: 
@@ -21,6 +23,8 @@ def setup_logging(name: str, log_dir: str = 'logs') -> logging.Logger:
     # Create a logger with the specified name
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
+    # Records are written by this logger's own handlers only, not again by handlers on the root logger
+    logger.propagate = False
 
     # Create a file handler and set its level to INFO
     log_file = os.path.join(log_dir, f"{name}.log")
@@ -32,7 +36,12 @@ def setup_logging(name: str, log_dir: str = 'logs') -> logging.Logger:
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
+
+        # Buffer records in memory and write them to the file in batches; errors are written immediately
+        buffered_handler = logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+        logger.addHandler(buffered_handler)
+        # Write out whatever is still buffered when the process exits
+        atexit.register(buffered_handler.flush)
 
         # Create a stream handler for console output
         stream_handler = logging.StreamHandler()
@@ -0,0 +1,33 @@
+'''
+Script to export the local embedding model to ONNX for faster inference with ONNX Runtime.
+The exported model is graph-optimized (fused LayerNorm/MatMul/GELU kernels) and saved to a local folder,
+which can then be used by setting in the .env file:
+    LOCAL_EMBEDDING_MODEL_NAME=<output folder>
+    LOCAL_EMBEDDING_BACKEND=onnx
+    LOCAL_EMBEDDING_ONNX_FILE=onnx/model_<optimization level>.onnx
+Requires the ONNX extra of sentence-transformers: pip install "sentence-transformers[onnx]"
+'''
+from sentence_transformers import SentenceTransformer, export_optimized_onnx_model
+
+from config.azure_config import LOCAL_EMBEDDING_MODEL_NAME
+
+# Set up logging
+from config.logging_config import setup_logging
+logger = setup_logging('export_onnx')
+
+def export_embedding_model(output_dir: str, optimization_level: str = "O2"):
+    '''Export the local embedding model to ONNX and save a graph-optimized copy.
+    Args:
+        output_dir (str): The folder where the exported model will be saved.
+        optimization_level (str): ONNX Runtime optimization level, from "O1" (basic) to "O4" (GPU, fp16).
+    '''
+    # Loading with the ONNX backend exports the model to ONNX if it has no ONNX weights yet
+    model = SentenceTransformer(LOCAL_EMBEDDING_MODEL_NAME, backend="onnx")
+    model.save_pretrained(output_dir)
+
+    # Save the optimized graph next to the plain export as onnx/model_<level>.onnx
+    export_optimized_onnx_model(model, optimization_config=optimization_level, model_name_or_path=output_dir)
+    logger.info(f"✅ Exported {LOCAL_EMBEDDING_MODEL_NAME} to {output_dir}/onnx/model_{optimization_level}.onnx")
+
+if __name__ == "__main__":
+    export_embedding_model(output_dir="models/embedding-onnx", optimization_level="O2")
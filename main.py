@@ -1,69 +1,90 @@
 '''
 Main script to run the document ingestion and processing pipeline.
-This script performs following operations.
-1. Downloads documents from Azure Blob Storage
-2. Extracts text from them
+This script performs following operations. Steps 1-4 run concurrently as stages of the ingestion pipeline.
+1. Generates SAS urls for documents in Azure Blob Storage
+2. Extracts text from them directly from blob storage
 3. Processes the extracted text into chunks and save them 
 4. Generates embeddings for the text chunks and Saves the chunks + embeddings for further use
 5. Retrieves relevant chunks based on a user query and generates an answer using those chunks.
 6. Generates an answer using the retrieved chunks and the user's query.
+With Azure services, the query is embedded while steps 1-4 are running (see main_async).
 '''
-from app.ingestion.blob_reader import download_blobs, generate_sas_url
-from app.ingestion.text_extractor import process_all_documents, process_blob_files
-from app.preprocessing.chunker import process_extracted_files
-from app.embeddings.embedder import get_embeddings, store_embeddings
-from app.retrieval.retriever import get_top_k_chunks
+import asyncio
+
+from app.pipeline.pipeline import run_pipeline
+from app.retrieval.retriever import get_top_k_chunks, get_top_k_chunks_async
 from app.generation.generator import generate_answer
 
 # Set up logging
 from config.logging_config import setup_logging
 logger = setup_logging('mainlogger')
 
+CONTAINER = "documents"     # Your Azure Blob container name
+
+def answer_query(query: str, relevant_chunks: list, use_azure: bool = False):
+    '''Generate and print the answer to the query from the retrieved chunks (step 6).
+    Args:
+        query (str): The question to be answered.
+        relevant_chunks (list): The chunks retrieved for the query.
+        use_azure (bool): Flag to determine whether to use Azure services or local model.
+    Returns:
+        None'''
+    if not relevant_chunks:
+        logger.warning("No relevant chunks found for the query.")
+        return
+
+    logger.info("🔹 Step 6: Generate answer using the retrieved chunks and the user's query")
+    answer = generate_answer(query=query, context_chunks=relevant_chunks, use_azure=use_azure)
+
+    # Print the final answer
+    print("\n🔍 USER QUERY:\n" + query)
+    print("\n🧠 FINAL RESPONSE:\n" + answer)
+    logger.info("✅ RAG Pipeline executed successfully")
+
+async def main_async(query: str, use_azure: bool = True):
+    '''Execute the RAG pipeline, embedding the query while the documents are being ingested.
+    Both run mostly as network calls to Azure, so overlapping them hides the shorter of the two.
+    The search itself waits for ingestion, so newly stored chunks are found.
+    Args:
+        query (str): The question to be answered.
+        use_azure (bool): Flag to determine whether to use Azure services or local model.
+    Returns:
+        None'''
+    logger.info("🔹 Steps 1-5: Ingest documents from blob SAS urls while embedding the query, then retrieve")
+    store_task = asyncio.create_task(asyncio.to_thread(
+        run_pipeline, container_name=CONTAINER, use_azure=use_azure, expiry_hours=1))
+    relevant_chunks = await get_top_k_chunks_async(query=query, use_azure=use_azure, ready=store_task)
+    if not await store_task:
+        logger.warning("No chunks were stored in the vector DB.")
+
+    await asyncio.to_thread(answer_query, query, relevant_chunks, use_azure)
+
 def main(query: str, use_azure: bool = False):
     '''Main function to execute the RAG pipeline.
+    With Azure services the steps are overlapped by main_async; with local models, which share the
+    CPU/GPU, they run one after another.
     Args:
         query (str): The question to be answered.
         use_azure (bool): Flag to determine whether to use Azure services or local model.
     Returns:
         None'''
     try:
-        # Download the blob file
-        container = "documents"     # Your Azure Blob container name
-        #logger.info("🔹 Step 1: Ingesting from Azure Blob")
-        #download_blobs(container_name=container, download_folder="data/")
-        logger.info("🔹 Step 1: Generate SAS urls for blobs")
-        blob_urls = generate_sas_url(container_name=container, expiry_hours=1)
-
-        #logger.info("🔹 Step 2: Extract content from all documents")
-        #process_all_documents(input_folder="data/", output_folder="extracted/")
-        logger.info("🔹 Step 2: Process documents from blob and extract text")
-        process_blob_files(sas_urls=blob_urls, output_folder="extracted/")
-        
-        logger.info("🔹 Step 3: Cleaning and Chunking of extracted text data")
-        chunks = process_extracted_files(input_folder="extracted/")
-
+        if use_azure:
+            asyncio.run(main_async(query=query, use_azure=use_azure))
+            return
 
-        logger.info("🔹 Step 4: Create embeddings and store them in Vector DB")
-        embeddings = get_embeddings(chunks=chunks, use_azure=use_azure)
-        store_embeddings(chunks=chunks, embeddings=embeddings, use_azure=use_azure)
+        logger.info("🔹 Steps 1-4: Extract, chunk, embed and store documents from blob SAS urls as a concurrent pipeline")
+        stored = run_pipeline(container_name=CONTAINER, use_azure=use_azure, expiry_hours=1)
+        if not stored:
+            logger.warning("No chunks were stored in the vector DB.")
 
         logger.info("🔹 Step 5: Retrieve relevant documents based on query")
         relevant_chunks = get_top_k_chunks(query=query, use_azure=use_azure)
 
-        if not relevant_chunks:
-            logger.warning("No relevant chunks found for the query.")
-            return
-        
-        logger.info("🔹 Step 6: Generate answer using the retrieved chunks and the user's query")
-        answer = generate_answer(query=query, context_chunks=relevant_chunks, use_azure=use_azure)
-
-        # Print the final answer
-        print("\n🔍 USER QUERY:\n" + query)
-        print("\n🧠 FINAL RESPONSE:\n" + answer)
-        logger.info("✅ RAG Pipeline executed successfully")
+        answer_query(query, relevant_chunks, use_azure)
 
     except Exception as e:
-        logger.exception(f"❌ Error in RAG pipeline: {e}")
+        logger.exception("❌ Error in RAG pipeline: %s", e)
 
 if __name__ == "__main__":
     use_azure = True           # Set to True to use Azure services, False for local model